@@ -0,0 +1,65 @@
+"""Article list, search, export and import on the synthetic database (see conftest.py)."""
+import csv
+import itertools
+import os
+import time
+
+SEARCHES = ['ordinateur', 'dell portable', 'chaise', 'cisco switch', 'climatiseur lg', 'utilitaire toyota']
+
+
+def bench_list(benchmark, client):
+    response = benchmark(client.get, '/articles')
+    assert response.status_code == 200
+
+
+def bench_list_next_page(benchmark, client, dataset):
+    # Keyset page from the middle of the table, as loaded while scrolling
+    response = benchmark(client.get, f"/articles/page?after={dataset['max_id'] // 2}")
+    assert response.json['count']
+
+
+def bench_search(benchmark, client):
+    queries = itertools.cycle(SEARCHES)
+    response = benchmark(lambda: client.get('/articles/search', query_string={'q': next(queries)}))
+    assert response.status_code == 200
+
+
+def bench_export_csv(benchmark, client):
+    # Whole table, streamed
+    response = benchmark(lambda: client.get('/articles/export?format=csv').get_data())
+    assert response.count(b'\n') > 1
+
+
+def bench_export_xlsx_site(benchmark, client, dataset):
+    site = dataset['site_ids'][0]
+    data = benchmark(lambda: client.get(f'/articles/export?format=xlsx&site={site}').get_data())
+    assert data.startswith(b'PK')
+
+
+def bench_import(benchmark, main, dataset, tmp_path):
+    """File of 1000 new articles, read and inserted as by the import job."""
+    sites = dataset['sites'] or [('', '')]
+    sous_familles = dataset['sous_familles'] or [('', '')]
+    # Barcodes not used by an earlier run on the same --bench-database
+    prefixes = (f"IMP{int(time.time())}-{n}" for n in itertools.count())
+
+    def write_file():
+        prefix = next(prefixes)
+        path = os.path.join(tmp_path, f"{prefix}.csv")
+        with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow(main.ARTICLE_EXPORT_HEADERS)
+            for i in range(1000):
+                zone, site = sites[i % len(sites)]
+                famille, sous_famille = sous_familles[i % len(sous_familles)]
+                writer.writerow(['', zone, site, '', '', f"{prefix}-{i:05d}", famille,
+                                 sous_famille, sous_famille or 'Article importé', f"SN{i:08d}", 'Dell',
+                                 'Latitude 5440', "En cours d'utilisation"])
+        return (path,), {}
+
+    def run(path):
+        with main.app.app_context():
+            return main.import_articles_frame(main.read_table_file(path))[0]
+
+    summary = benchmark.pedantic(run, setup=write_file, rounds=5)
+    assert summary['inserted'] == 1000, summary
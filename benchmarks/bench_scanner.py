@@ -0,0 +1,30 @@
+"""Scanner paths on the synthetic database (see conftest.py): barcode lookups and the scanner form."""
+import itertools
+
+
+def bench_barcode_lookup(benchmark, client, dataset):
+    codes = itertools.cycle(dataset['codes'])
+    response = benchmark(lambda: client.get(f"/article/get/{next(codes)}"))
+    assert response.status_code == 200
+
+
+def bench_barcode_unknown(benchmark, client):
+    response = benchmark(client.get, '/article/get/INCONNU-0000')
+    assert response.status_code == 404
+
+
+def bench_barcode_batch(benchmark, client, dataset):
+    # One scanner queue of 50 codes
+    batches = itertools.cycle([dataset['codes'][i:i + 50] for i in range(0, len(dataset['codes']), 50)])
+    response = benchmark(lambda: client.post('/article/get-batch', json={'barcodes': next(batches)}))
+    assert not response.json['missing']
+
+
+def bench_scanner_post(benchmark, main, client, dataset):
+    """Scanner form saved for an existing article (update), without following the redirect."""
+    data = dataset['scanner_form']
+    form = {field: data[key] for field, key in main.SYNC_FIELDS.items()}
+    form['barcode'] = dataset['codes'][0]
+    statuts = itertools.cycle(["En cours d'utilisation", "En maintenance"])
+    response = benchmark(lambda: client.post('/scanner', data=dict(form, statut=next(statuts))))
+    assert response.status_code == 302
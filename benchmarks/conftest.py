@@ -0,0 +1,125 @@
+"""
+Fixtures of the pytest-benchmark suite (bench_*.py). The application runs
+from a temporary copy of the tree (see startup_time.py) on a database
+filled by main.generate_synthetic_data, so data/app.db is never touched.
+
+    python -m pytest benchmarks [--bench-articles 20000] [--bench-scans 50000]
+    python -m pytest benchmarks --bench-database postgresql://user@host/assetflow_bench
+
+A --bench-database that already holds articles is used as is (generate a
+large one once with 'flask --app main seed-data --articles 1000000').
+
+Each run is saved to .benchmarks/ under the commit id. Compare with the
+previous run, or list the saved ones:
+
+    python -m pytest benchmarks --benchmark-compare
+    pytest-benchmark compare --columns=median,ops
+"""
+import os
+import sys
+
+import pytest
+
+from startup_time import copy_tree
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('assetflow', "AssetFlow benchmark data")
+    group.addoption('--bench-articles', type=int, default=20000, help="articles generated (default 20000)")
+    group.addoption('--bench-scans', type=int, default=50000, help="scan_history rows generated (default 50000)")
+    group.addoption('--bench-seed', type=int, default=42, help="seed of the generated data (default 42)")
+    group.addoption('--bench-database', help="database URL to use instead of a temporary SQLite file")
+
+
+@pytest.fixture(scope='session')
+def main(request, tmp_path_factory):
+    """The main module, imported from a copy of the tree, with its database ready."""
+    tree = str(tmp_path_factory.mktemp('tree'))
+    copy_tree(tree)
+    config = request.config
+    url = config.getoption('bench_database') or f"sqlite:///{os.path.join(tree, 'data', 'bench.db')}"
+
+    # main reads its settings at import, and templates from the working directory
+    saved = os.environ.get('DATABASE_URL'), os.getcwd()
+    os.environ['DATABASE_URL'] = url
+    os.chdir(tree)
+    sys.path.insert(0, tree)
+    sys.modules.pop('main', None)
+    import main
+
+    main.app.config.update(WTF_CSRF_ENABLED=False)
+    with main.app.app_context():
+        main.init_db()
+        if not main.db.session.execute(main.db.select(main.Article.id).limit(1)).first():
+            main.generate_synthetic_data(seed=config.getoption('bench_seed'),
+                                         articles=config.getoption('bench_articles'),
+                                         scans=config.getoption('bench_scans'))
+    main.create_app()
+    yield main
+
+    main.flush_scans()
+    with main.app.app_context():
+        main.db.engine.dispose()
+    sys.path.remove(tree)
+    os.chdir(saved[1])
+    if saved[0] is None:
+        del os.environ['DATABASE_URL']
+    else:
+        os.environ['DATABASE_URL'] = saved[0]
+
+
+@pytest.fixture(scope='session')
+def client(main):
+    """Test client logged in as admin."""
+    client = main.app.test_client()
+    response = client.post('/login', data={'username': 'admin', 'password': '12345'})
+    assert response.status_code == 302, "admin login failed"
+    return client
+
+
+@pytest.fixture(scope='session')
+def dataset(main):
+    """Values picked from the database, in a fixed order: barcodes, reference ids and names."""
+    db = main.db
+    with main.app.app_context():
+        codes = db.session.execute(db.select(main.Article.qr_code).where(main.Article.qr_code.isnot(None))
+                                   .order_by(main.Article.id).limit(2000)).scalars().all()
+        article = db.session.execute(db.select(main.Article).where(main.Article.qr_code == codes[0])).scalar_one()
+        return {
+            'codes': codes,
+            'scanner_form': {k: '' if v is None else str(v) for k, v in main.article_scan_data(article).items()},
+            'site_ids': db.session.execute(db.select(main.Site.id).order_by(main.Site.id)).scalars().all(),
+            'max_id': db.session.execute(db.select(db.func.max(main.Article.id))).scalar(),
+            # Names that belong together, for imports: (société, site) and (famille, sous-famille)
+            'sites': db.session.execute(db.select(main.Zone.nom, main.Site.nom).join(main.Site.zone)
+                                        .order_by(main.Site.id)).all(),
+            'sous_familles': db.session.execute(db.select(main.Famille.nom, main.SousFamille.nom)
+                                                .join(main.SousFamille.famille)
+                                                .order_by(main.SousFamille.id)).all(),
+        }
+
+
+# Latency percentiles, which the pytest-benchmark table does not show: kept
+# in extra_info (saved with the run) and printed at the end of the session
+_percentiles = []
+
+
+@pytest.fixture(autouse=True)
+def percentiles(benchmark):
+    yield
+    stats = benchmark.stats
+    if stats is None or not stats.stats.data:
+        return
+    data = sorted(stats.stats.data)
+    p95 = data[min(len(data) - 1, int(len(data) * 0.95))]
+    benchmark.extra_info['p95_ms'] = round(p95 * 1000, 3)
+    _percentiles.append((benchmark.name, data[len(data) // 2], p95, 1 / stats.stats.mean))
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _percentiles:
+        return
+    terminalreporter.section("latency (ms) and throughput")
+    terminalreporter.write_line(f"{'benchmark':36} {'p50':>9} {'p95':>9} {'ops/s':>9}")
+    for name, p50, p95, ops in _percentiles:
+        terminalreporter.write_line(f"{name:36} {p50 * 1000:9.2f} {p95 * 1000:9.2f} {ops:9.1f}")
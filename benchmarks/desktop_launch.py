@@ -0,0 +1,98 @@
+"""
+Launch-to-usable time of the desktop application: time from starting the
+process until /login answers (server usable) and until the browser is
+opened. The browser is replaced by a script recording when it is called
+($BROWSER), so nothing is opened on screen.
+
+By default main.py is run from a temporary copy of the tree (see
+startup_time.py); --compare runs an older revision as well. A built
+executable can be measured instead (its data/ folder is created next to it):
+
+    python benchmarks/desktop_launch.py [--runs 5] [--compare HEAD~1]
+    python benchmarks/desktop_launch.py --exe dist/main/main
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from startup_time import copy_tree
+
+TIMEOUT = 60
+
+
+def launch(command, cwd, port, marker):
+    env = dict(os.environ, PORT=str(port), OPEN_BROWSER='1')
+    env.pop('DATABASE_URL', None)
+    env['BROWSER'] = f'"{sys.executable}" -c "import time; open(r\'{marker}\', \'w\').write(repr(time.time()))" %s'
+    if os.path.exists(marker):
+        os.remove(marker)
+
+    log = open(marker + '.log', 'w+')
+    start = time.time()
+    process = subprocess.Popen(command, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+    usable = browser = None
+    try:
+        while time.time() - start < TIMEOUT and browser is None:
+            if process.poll() is not None:
+                log.seek(0)
+                raise RuntimeError(f"{command[0]} exited with code {process.returncode}:\n{log.read()[-2000:]}")
+            if usable is None:
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}/login", timeout=1) as response:
+                        if response.status == 200:
+                            usable = time.time() - start
+                except (urllib.error.URLError, ConnectionError):
+                    pass
+            if os.path.exists(marker):
+                with open(marker) as f:
+                    content = f.read()
+                if content:
+                    browser = float(content) - start
+            time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait()
+        log.close()
+    return usable, browser
+
+
+def measure(label, command, cwd, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        marker = os.path.join(tmp, 'browser')
+        # First launch creates the database, it is not counted
+        launch(command, cwd, args.port, marker)
+        results = [launch(command, cwd, args.port, marker) for _ in range(args.runs)]
+
+    usable = [r[0] for r in results if r[0] is not None]
+    browser = [r[1] for r in results if r[1] is not None]
+    show = lambda values: f"{statistics.median(values):6.2f} s" if values else "     - "
+    print(f"{label:24} usable {show(usable)}   browser opened {show(browser)}   (median of {args.runs})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--port', type=int, default=5000, help="older revisions always listen on 5000")
+    parser.add_argument('--exe', help="built executable to measure instead of main.py")
+    parser.add_argument('--compare', metavar='REVISION', help="git revision of the baseline main.py")
+    args = parser.parse_args()
+
+    if args.exe:
+        exe = os.path.abspath(args.exe)
+        measure(os.path.basename(exe), [exe], os.path.dirname(exe), args)
+        return
+
+    for label, revision in ([(args.compare, args.compare)] if args.compare else []) + [("working tree", None)]:
+        with tempfile.TemporaryDirectory() as tree:
+            copy_tree(tree, revision)
+            measure(label, [sys.executable, 'main.py'], tree, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,375 @@
+"""
+HTTP load test: gunicorn serving a copy of the tree (see startup_time.py)
+on a synthetic database (flask seed-data), driven by concurrent clients
+that each log in and loop over a weighted mix of the main paths. Reports
+throughput and p50/p95/p99 latency per path and saves the results to
+.benchmarks/load/ under the commit id; --compare shows the change from
+the previous saved run.
+
+    python benchmarks/load_test.py [--clients 16] [--seconds 30] [--articles 50000] [--compare]
+    python benchmarks/load_test.py --revision HEAD~3      # serve an older main.py, same data
+    python benchmarks/load_test.py --database-url postgresql://user@host/assetflow_bench [--no-seed]
+
+The database is always generated by the working tree; older revisions are
+served with their own code. Imports run as background jobs: their latency
+goes from the upload to the end of the job.
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from metrics_scrape import login, wait_ready
+from startup_time import ROOT, copy_tree
+
+RESULTS_DIR = os.path.join(ROOT, '.benchmarks', 'load')
+
+# Scenario -> share of the requests, scanner lookups first like in the field
+MIX = {'barcode': 40, 'scanner': 15, 'list': 15, 'search': 15, 'export': 3, 'import': 2}
+
+SEARCHES = ['ordinateur', 'dell portable', 'chaise', 'cisco switch', 'climatiseur lg', 'utilitaire toyota']
+
+# Older revisions have no create_app(): serve their app object as is
+WSGI = "import main\napp = main.create_app() if hasattr(main, 'create_app') else main.app\n"
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    # The scanner form answers with a redirect: time the POST alone.
+    # Runs before the default redirect handler of the opener.
+    handler_order = 400
+
+    def http_error_302(self, request, response, code, message, headers):
+        return response
+
+    http_error_301 = http_error_303 = http_error_307 = http_error_302
+
+
+def git(*args):
+    return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+
+
+def load_dataset(url):
+    """Barcodes, scanner forms and names to build the requests from, read from the database."""
+    engine = sa.create_engine(url.replace('postgresql://', 'postgresql+psycopg://', 1))
+    with engine.connect() as conn:
+        rows = conn.execute(sa.text(
+            "SELECT qr_code, zone_id, site_id, local_id, famille_id, sous_famille_id, affecte_a, designation, "
+            "serial_number, marque, modele, statut FROM article WHERE qr_code IS NOT NULL ORDER BY id LIMIT 5000"
+        )).mappings().all()
+        sites = conn.execute(sa.text(
+            "SELECT site.id, zone.nom AS zone, site.nom FROM site JOIN zone ON zone.id = site.zone_id ORDER BY site.id"
+        )).all()
+        sous_familles = conn.execute(sa.text(
+            "SELECT famille.nom, sous_famille.nom FROM sous_famille "
+            "JOIN famille ON famille.id = sous_famille.famille_id ORDER BY sous_famille.id"
+        )).all()
+    engine.dispose()
+    if not rows:
+        raise SystemExit("The database has no article with a barcode: run without --no-seed")
+    forms = [{
+        'barcode': row['qr_code'], 'zone': row['zone_id'], 'site': row['site_id'], 'local': row['local_id'],
+        'famille': row['famille_id'], 'sous_famille': row['sous_famille_id'], 'affecte_a': row['affecte_a'],
+        'designation': row['designation'], 'serial_number': row['serial_number'], 'marque': row['marque'],
+        'modele': row['modele'], 'statut': row['statut'],
+    } for row in rows[:200]]
+    return {
+        'codes': [row['qr_code'] for row in rows],
+        'forms': [{k: '' if v is None else str(v) for k, v in form.items()} for form in forms],
+        'sites': sites,
+        'sous_familles': sous_familles,
+    }
+
+
+def import_file(dataset, prefix, rows=100):
+    """CSV with the export columns, new matricules and barcodes (older revisions require the matricule)."""
+    lines = ["Matricule;Société;Site;Emplacement;Affectation;Code-barre;Famille;Sous-famille;Désignation;"
+             "Numéro de série;Marque;Modèle;Etat"]
+    sites = dataset['sites'] or [(None, '', '')]
+    sous_familles = dataset['sous_familles'] or [('', '')]
+    for i in range(rows):
+        _, zone, site = sites[i % len(sites)]
+        famille, sous_famille = sous_familles[i % len(sous_familles)]
+        lines.append(f"M{prefix}-{i:04d};{zone};{site};;;{prefix}-{i:04d};{famille};{sous_famille};{sous_famille or 'Article'};"
+                     f"SN{i:08d};Dell;Latitude 5440;En cours d'utilisation")
+    return ("\n".join(lines) + "\n").encode('utf-8-sig')
+
+
+class Client:
+    """One scanner or browser: its own session, looping over the mix."""
+
+    def __init__(self, base, dataset, seed):
+        self.base = base
+        self.dataset = dataset
+        self.rng = random.Random(seed)
+        self.opener = login(base)
+        self.opener.add_handler(NoRedirect())
+        self.token = json.loads(self.opener.open(f"{base}/api/csrf").read())['csrf_token']
+        self.imports = itertools.count()
+        self.id = seed
+
+    def send(self, path, data=None, headers=None):
+        request = urllib.request.Request(self.base + path, data=data, headers={'X-CSRFToken': self.token,
+                                                                               **(headers or {})})
+        try:
+            with self.opener.open(request, timeout=120) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as error:
+            return error.code, error.read()
+
+    def barcode(self):
+        code = self.rng.choice(self.dataset['codes'])
+        return self.send(f"/article/get/{urllib.parse.quote(code)}")[0] == 200
+
+    def scanner(self):
+        form = dict(self.rng.choice(self.dataset['forms']), csrf_token=self.token)
+        form['statut'] = self.rng.choice(["En cours d'utilisation", "En maintenance"])
+        return self.send('/scanner', urllib.parse.urlencode(form).encode())[0] == 302
+
+    def list(self):
+        return self.send('/articles')[0] == 200
+
+    def search(self):
+        return self.send('/articles/search?' + urllib.parse.urlencode({'q': self.rng.choice(SEARCHES)}))[0] == 200
+
+    def export(self):
+        site = self.rng.choice(self.dataset['sites'])[0] if self.dataset['sites'] else ''
+        return self.send(f"/articles/export?format=csv&site={site}")[0] == 200
+
+    def import_(self):
+        boundary = uuid.uuid4().hex
+        content = import_file(self.dataset, f"LT{self.id}-{next(self.imports)}-{boundary[:8]}")
+        body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"import.csv\"\r\n"
+                f"Content-Type: text/csv\r\n\r\n").encode() + content + f"\r\n--{boundary}--\r\n".encode()
+        status, answer = self.send('/articles/import', body,
+                                   {'Content-Type': f"multipart/form-data; boundary={boundary}"})
+        if status != 202:
+            return False
+        job = json.loads(answer)
+        while job['status'] in ('pending', 'running'):
+            time.sleep(0.05)
+            status, answer = self.send(job['status_url'])
+            if status != 200:
+                return False
+            job = json.loads(answer)
+        return job['status'] == 'done' and job['result']['inserted'] > 0
+
+
+def run_load(base, dataset, args):
+    plan = [name for name, weight in args.mix.items() for _ in range(weight)]
+    clients = [Client(base, dataset, i) for i in range(args.clients)]
+    results = {name: [] for name in args.mix}
+    errors = {name: 0 for name in args.mix}
+    first_error = {}
+    lock = threading.Lock()
+    start = threading.Barrier(args.clients + 1)
+
+    def loop(client):
+        latencies = {name: [] for name in args.mix}
+        failed = {name: 0 for name in args.mix}
+        start.wait()
+        end = time.perf_counter() + args.seconds
+        while time.perf_counter() < end:
+            name = client.rng.choice(plan)
+            began = time.perf_counter()
+            try:
+                ok = getattr(client, 'import_' if name == 'import' else name)()
+            except Exception as error:  # counted as failed, the first one is shown
+                ok = False
+                with lock:
+                    first_error.setdefault(name, repr(error))
+            if ok:
+                latencies[name].append(time.perf_counter() - began)
+            else:
+                failed[name] += 1
+        with lock:
+            for name in args.mix:
+                results[name].extend(latencies[name])
+                errors[name] += failed[name]
+
+    threads = [threading.Thread(target=loop, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    for name, error in first_error.items():
+        print(f"  {name} failed: {error}")
+    return summarize(results, errors, elapsed)
+
+
+def percentile(values, share):
+    return values[min(len(values) - 1, int(len(values) * share))] if values else None
+
+
+def summarize(results, errors, elapsed):
+    summary = {}
+    everything = []
+    for name, latencies in list(results.items()) + [('total', None)]:
+        if latencies is None:
+            latencies, failed = everything, sum(errors.values())
+        else:
+            everything.extend(latencies)
+            failed = errors[name]
+        latencies = sorted(latencies)
+        ms = lambda value: round(value * 1000, 2) if value is not None else None
+        summary[name] = {
+            'requests': len(latencies), 'errors': failed, 'rps': round(len(latencies) / elapsed, 2),
+            'p50_ms': ms(percentile(latencies, 0.5)), 'p95_ms': ms(percentile(latencies, 0.95)),
+            'p99_ms': ms(percentile(latencies, 0.99)), 'max_ms': ms(latencies[-1] if latencies else None),
+            'mean_ms': ms(statistics.fmean(latencies) if latencies else None),
+        }
+    return summary
+
+
+def show(summary, previous=None):
+    fmt = lambda value: f"{value:9.1f}" if value is not None else "        -"
+    print(f"{'path':10} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'max ms':>9}" + ("   vs previous: req/s   p95" if previous else ""))
+    for name, row in summary.items():
+        line = (f"{name:10} {row['requests']:9d} {row['errors']:7d} {fmt(row['rps'])} {fmt(row['p50_ms'])} "
+                f"{fmt(row['p95_ms'])} {fmt(row['p99_ms'])} {fmt(row['max_ms'])}")
+        old = (previous or {}).get(name)
+        if old:
+            change = lambda new, before: f"{(new - before) / before * 100:+6.1f} %" if new and before else "      -"
+            line += f"   {change(row['rps'], old['rps'])} {change(row['p95_ms'], old['p95_ms'])}"
+        print(line)
+
+
+def save(summary, args, label):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    commit = git('rev-parse', 'HEAD') if not args.revision else git('rev-parse', args.revision)
+    dirty = not args.revision and bool(git('status', '--porcelain', '--untracked-files=no'))
+    run = {
+        'commit': commit, 'revision': label, 'dirty': dirty, 'date': datetime.now().isoformat(timespec='seconds'),
+        'machine': platform.node(), 'python': platform.python_version(),
+        'settings': {k: v for k, v in vars(args).items() if k not in ('compare', 'database_url')},
+        'database': 'sqlite' if args.database_url.startswith('sqlite') else args.database_url.split(':', 1)[0],
+        'results': summary,
+    }
+    path = os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d_%H%M%S}_{commit[:12]}{'-dirty' if dirty else ''}.json")
+    with open(path, 'w') as f:
+        json.dump(run, f, indent=2)
+    return path
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in MIX:
+            raise argparse.ArgumentTypeError(f"unknown path {name!r}, expected one of {', '.join(MIX)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=16, help="concurrent clients")
+    parser.add_argument('--seconds', type=int, default=30)
+    parser.add_argument('--workers', type=int, help="gunicorn workers (default: gunicorn.conf.py)")
+    parser.add_argument('--mix', type=parse_mix, default=MIX,
+                        help="weights per path, e.g. barcode=10,list=1 (default: %(default)s)")
+    parser.add_argument('--articles', type=int, default=50000)
+    parser.add_argument('--scans', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url', help="database to run on instead of a temporary SQLite file")
+    parser.add_argument('--no-seed', action='store_true', help="use the --database-url data as is")
+    parser.add_argument('--revision', help="git revision to serve instead of the working tree")
+    parser.add_argument('--port', type=int, default=5091)
+    parser.add_argument('--compare', nargs='?', const='previous', metavar='RESULT',
+                        help="saved result (.json) to compare with, the previous run by default")
+    args = parser.parse_args()
+    base = f"http://127.0.0.1:{args.port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        args.database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        env = dict(os.environ, DATABASE_URL=args.database_url, PORT=str(args.port), GUNICORN_ACCESS_LOG='',
+                   PROMETHEUS_MULTIPROC_DIR=os.path.join(tmp, 'metrics'))
+        if args.workers:
+            env['WEB_CONCURRENCY'] = str(args.workers)
+
+        if not args.no_seed:
+            seed_tree = os.path.join(tmp, 'seed')
+            os.mkdir(seed_tree)
+            copy_tree(seed_tree)
+            flask = [sys.executable, '-m', 'flask', '--app', 'main']
+            subprocess.run(flask + ['init-db'], cwd=seed_tree, env=env, check=True, capture_output=True)
+            started = time.perf_counter()
+            subprocess.run(flask + ['seed-data', '--seed', str(args.seed), '--articles', str(args.articles),
+                                    '--scans', str(args.scans)], cwd=seed_tree, env=env, check=True,
+                           capture_output=True)
+            print(f"{args.articles} articles and {args.scans} scans generated in "
+                  f"{time.perf_counter() - started:.1f} s")
+        dataset = load_dataset(args.database_url)
+
+        tree = os.path.join(tmp, 'serve')
+        os.mkdir(tree)
+        copy_tree(tree, args.revision)
+        shutil.copy(os.path.join(ROOT, 'gunicorn.conf.py'), tree)
+        with open(os.path.join(tree, 'main.py'), encoding='utf-8') as f:
+            reads_url = 'DATABASE_URL' in f.read()
+        if not reads_url:
+            # Revisions before DATABASE_URL only open data/app.db
+            if not args.database_url.startswith('sqlite:///'):
+                raise SystemExit(f"{args.revision} only runs on SQLite (data/app.db)")
+            os.mkdir(os.path.join(tree, 'data'))
+            with sqlite3.connect(args.database_url[len('sqlite:///'):]) as source, \
+                    sqlite3.connect(os.path.join(tree, 'data', 'app.db')) as copy:
+                source.backup(copy)
+        with open(os.path.join(tree, 'load_test_wsgi.py'), 'w') as f:
+            f.write(WSGI)
+        log = open(os.path.join(tmp, 'gunicorn.log'), 'w+')
+        process = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'load_test_wsgi:app'], cwd=tree, env=env,
+                                   stdout=log, stderr=subprocess.STDOUT)
+        try:
+            try:
+                wait_ready(base, process)
+            except RuntimeError:
+                log.seek(0)
+                print(log.read()[-2000:])
+                raise
+            label = args.revision or "working tree"
+            print(f"{label}: {args.clients} clients for {args.seconds} s")
+            summary = run_load(base, dataset, args)
+        finally:
+            process.terminate()
+            process.wait()
+            log.close()
+
+    previous = None
+    if args.compare:
+        saved = sorted(glob.glob(os.path.join(RESULTS_DIR, '*.json')))
+        path = saved[-1] if args.compare == 'previous' and saved else args.compare
+        if os.path.exists(path):
+            with open(path) as f:
+                old = json.load(f)
+            previous = old['results']
+            print(f"compared with {os.path.basename(path)} ({old['revision']}, {old['database']}, {old['date']})")
+        else:
+            print("no saved result to compare with")
+    show(summary, previous)
+    print("saved to", os.path.relpath(save(summary, args, label), ROOT))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Check of the /metrics endpoint under gunicorn: starts the app with several
+workers on a temporary copy of the tree (see startup_time.py), sends a
+synthetic load of barcode lookups and list pages, then scrapes /metrics
+and checks that the counters and histogram buckets add up across workers.
+
+    python benchmarks/metrics_scrape.py [--workers 3] [--requests 600]
+"""
+import argparse
+import concurrent.futures
+import http.cookiejar
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+
+from prometheus_client.parser import text_string_to_metric_families
+
+from startup_time import ROOT, copy_tree
+
+# Share of the load per page, barcode lookups first like on the scanners
+PAGES = [('get_article_by_barcode', '/article/get/BENCH{i:06d}', 8), ('articles_list', '/articles', 1),
+         ('liste_salaries', '/salaries', 1)]
+
+
+def login(base):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    page = opener.open(f"{base}/login").read().decode()
+    token = re.search(r'name="csrf_token"[^>]*value="([^"]+)"|name="csrf-token" content="([^"]+)"', page)
+    data = urllib.parse.urlencode({'username': 'admin', 'password': '12345',
+                                   'csrf_token': token.group(1) or token.group(2)}).encode()
+    opener.open(f"{base}/login", data)
+    return opener
+
+
+def wait_ready(base, process):
+    for _ in range(300):
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(f"{base}/login", timeout=1)
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.1)
+    raise RuntimeError("gunicorn did not answer")
+
+
+def scrape(base):
+    text = urllib.request.urlopen(f"{base}/metrics").read().decode()
+    return {family.name: family for family in text_string_to_metric_families(text)}
+
+
+def samples(families):
+    """{(sample name, endpoint, le): value}, requests summed over methods and statuses."""
+    values = Counter()
+    for sample in families['assetflow_http_requests'].samples:
+        if sample.name.endswith('_total'):
+            values[sample.name, sample.labels['endpoint'], None] += sample.value
+    for sample in families['assetflow_http_request_duration_seconds'].samples:
+        values[sample.name, sample.labels['endpoint'], sample.labels.get('le')] += sample.value
+    return values
+
+
+def check(before, after, sent):
+    """Compare the samples added by the load with what was sent."""
+    delta = samples(after)
+    delta.subtract(samples(before))
+    errors = []
+    for endpoint, count in sent.items():
+        counted = delta['assetflow_http_requests_total', endpoint, None]
+        if counted != count:
+            errors.append(f"{endpoint}: {counted:.0f} requests counted, {count} sent")
+
+        buckets = sorted((float(le), value) for (name, ep, le), value in delta.items()
+                         if ep == endpoint and name.endswith('_bucket'))
+        total = delta['assetflow_http_request_duration_seconds_count', endpoint, None]
+        values = [value for _, value in buckets]
+        if values != sorted(values):
+            errors.append(f"{endpoint}: buckets are not cumulative {values}")
+        if buckets[-1] != (float('inf'), total) or total != count:
+            errors.append(f"{endpoint}: +Inf bucket {buckets[-1][1]:.0f}, count {total:.0f}, {count} sent")
+        p95 = next(le for le, value in buckets if value >= 0.95 * total)
+        print(f"    {endpoint:24} {total:6.0f} requests   p95 <= {p95 * 1000:g} ms")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--requests', type=int, default=600)
+    parser.add_argument('--port', type=int, default=5090)
+    args = parser.parse_args()
+    base = f"http://127.0.0.1:{args.port}"
+
+    with tempfile.TemporaryDirectory() as tree:
+        copy_tree(tree, None)
+        for name in ('gunicorn.conf.py', 'wsgi.py'):
+            shutil.copy(os.path.join(ROOT, name), tree)
+        env = dict(os.environ, PORT=str(args.port), WEB_CONCURRENCY=str(args.workers),
+                   PROMETHEUS_MULTIPROC_DIR=os.path.join(tree, 'metrics'), GUNICORN_ACCESS_LOG='')
+        env.pop('DATABASE_URL', None)
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'main', 'init-db'],
+                       cwd=tree, env=env, check=True, capture_output=True)
+        process = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'wsgi:app'], cwd=tree, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_ready(base, process)
+            opener = login(base)
+            before = scrape(base)
+            plan = [endpoint for endpoint, _, weight in PAGES for _ in range(weight)]
+            urls = {endpoint: url for endpoint, url, _ in PAGES}
+            jobs = [(plan[i % len(plan)], i) for i in range(args.requests)]
+
+            def send(job):
+                endpoint, i = job
+                try:
+                    opener.open(base + urls[endpoint].format(i=i)).read()
+                except urllib.error.HTTPError:  # 404 for unknown barcodes
+                    pass
+
+            start = time.perf_counter()
+            with concurrent.futures.ThreadPoolExecutor(16) as executor:
+                list(executor.map(send, jobs))
+            elapsed = time.perf_counter() - start
+            sent = Counter(endpoint for endpoint, _ in jobs)
+            print(f"{args.requests} requests on {args.workers} workers in {elapsed:.1f} s")
+
+            errors = check(before, scrape(base), sent)
+        finally:
+            process.terminate()
+            process.wait()
+
+    for error in errors:
+        print("ERROR", error)
+    print("metrics OK" if not errors else f"{len(errors)} error(s)")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Concurrent read/write throughput of SQLite, default settings vs the
+profile applied by main.set_sqlite_pragmas (WAL, synchronous=NORMAL,
+busy_timeout, mmap, cache).
+
+Each worker is a separate process, like gunicorn workers: writers insert
+scan-like rows one transaction at a time, readers run the indexed lookups
+of the scanner. Run:
+
+    python benchmarks/sqlite_concurrency.py [--seconds 5] [--writers 4] [--readers 4]
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+# Same values as the defaults of main.py
+TUNED = [
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA mmap_size = {256 * 1024 * 1024}",
+    "PRAGMA cache_size = -64000",
+    "PRAGMA foreign_keys = ON",
+]
+# Python's sqlite3 default: rollback journal, synchronous=FULL, 5 s timeout
+DEFAULT = []
+
+ROWS = 50_000
+
+
+def connect(path, pragmas):
+    conn = sqlite3.connect(path, timeout=5)
+    for pragma in pragmas:
+        conn.execute(pragma)
+    return conn
+
+
+def setup(path, pragmas):
+    conn = connect(path, pragmas)
+    conn.execute("CREATE TABLE article (id INTEGER PRIMARY KEY, qr_code TEXT UNIQUE, designation TEXT)")
+    conn.execute("CREATE TABLE scan_history (id INTEGER PRIMARY KEY, qr_code TEXT, timestamp REAL)")
+    conn.executemany(
+        "INSERT INTO article (qr_code, designation) VALUES (?, ?)",
+        ((f"QR{i:08d}", f"Article {i}") for i in range(ROWS))
+    )
+    conn.commit()
+    conn.close()
+
+
+def writer(path, pragmas, seconds, counter, errors):
+    conn = connect(path, pragmas)
+    done = failed = i = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        try:
+            conn.execute("INSERT INTO scan_history (qr_code, timestamp) VALUES (?, ?)",
+                         (f"QR{i % ROWS:08d}", time.time()))
+            conn.commit()
+            done += 1
+        except sqlite3.OperationalError:  # database is locked
+            conn.rollback()
+            failed += 1
+        i += 1
+    with counter.get_lock():
+        counter.value += done
+    with errors.get_lock():
+        errors.value += failed
+
+
+def reader(path, pragmas, seconds, counter, errors):
+    conn = connect(path, pragmas)
+    done = failed = i = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        try:
+            conn.execute("SELECT id, designation FROM article WHERE qr_code = ?",
+                         (f"QR{(i * 7919) % ROWS:08d}",)).fetchone()
+            conn.execute("SELECT qr_code, timestamp FROM scan_history ORDER BY id DESC LIMIT 10").fetchall()
+            done += 1
+        except sqlite3.OperationalError:
+            failed += 1
+        i += 1
+    with counter.get_lock():
+        counter.value += done
+    with errors.get_lock():
+        errors.value += failed
+
+
+def run(name, pragmas, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        setup(path, pragmas)
+        counters = {role: (multiprocessing.Value('i', 0), multiprocessing.Value('i', 0))
+                    for role in ('write', 'read')}
+        workers = [
+            multiprocessing.Process(target=writer, args=(path, pragmas, args.seconds, *counters['write']))
+            for _ in range(args.writers)
+        ] + [
+            multiprocessing.Process(target=reader, args=(path, pragmas, args.seconds, *counters['read']))
+            for _ in range(args.readers)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    (writes, write_errors), (reads, read_errors) = counters['write'], counters['read']
+    print(f"{name:8} writes/s {writes.value / args.seconds:9.0f}   reads/s {reads.value / args.seconds:9.0f}"
+          f"   locked errors {write_errors.value + read_errors.value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writer and {args.readers} reader processes, {args.seconds:g} s each")
+    run("default", DEFAULT, args)
+    run("tuned", TUNED, args)
+
+
+if __name__ == '__main__':
+    main()
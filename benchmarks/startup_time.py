@@ -0,0 +1,101 @@
+"""
+Cold start of main.py: wall time of a fresh interpreter importing main and
+calling create_app(), with the -X importtime breakdown of the modules main
+imports. The tree is copied to a temporary directory, so data/app.db is
+never touched. Give a git revision to compare with an older main.py:
+
+    python benchmarks/startup_time.py [--runs 5] [--top 12] [--compare HEAD~1]
+"""
+import argparse
+import io
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FILES = ['main.py', 'templates', 'static', 'migrations']
+
+# Older revisions set everything up at import and have no create_app()
+STARTUP = "import main\nif hasattr(main, 'create_app'): main.create_app()"
+SETUP = ("import main\n"
+         "if hasattr(main, 'init_db'):\n"
+         "    with main.app.app_context(): main.init_db()")
+
+
+def copy_tree(dest, revision=None):
+    if revision is None:
+        for name in FILES:
+            src = os.path.join(ROOT, name)
+            if os.path.isdir(src):
+                shutil.copytree(src, os.path.join(dest, name), ignore=shutil.ignore_patterns('__pycache__'))
+            else:
+                shutil.copy(src, dest)
+        return
+    archive = subprocess.run(['git', 'archive', revision, *FILES], cwd=ROOT, check=True, capture_output=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(dest)
+
+
+def python(tree, code, importtime=False):
+    args = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    env.pop('DATABASE_URL', None)
+    return subprocess.run(args, cwd=tree, env=env, check=True, capture_output=True, text=True)
+
+
+def breakdown(stderr):
+    """(self, {module imported by main: cumulative}) in microseconds."""
+    own, modules = 0, {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() == 'main':
+            own = int(self_us)
+        elif name.startswith('   ') and not name.startswith('    '):
+            # Two spaces of nesting below main (plus the separator's own space)
+            modules[name.strip()] = int(cumulative)
+    return own, modules
+
+
+def measure(label, revision, args):
+    with tempfile.TemporaryDirectory() as tree:
+        copy_tree(tree, revision)
+        # Create the database first, startup is measured on an existing one
+        python(tree, SETUP)
+
+        times = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            python(tree, STARTUP)
+            times.append(time.perf_counter() - start)
+        own, modules = breakdown(python(tree, STARTUP, importtime=True).stderr)
+
+    print(f"{label}: startup {statistics.median(times) * 1000:.0f} ms median of {args.runs}"
+          f" (min {min(times) * 1000:.0f} ms)")
+    print(f"    {'main (module body)':28} {own / 1000:8.1f} ms")
+    for name, cumulative in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"    {name:28} {cumulative / 1000:8.1f} ms")
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=12, help="modules shown in the import breakdown")
+    parser.add_argument('--compare', metavar='REVISION', help="git revision of the baseline main.py")
+    args = parser.parse_args()
+
+    baseline = measure(args.compare, args.compare, args) if args.compare else None
+    current = measure("working tree", None, args)
+    if baseline:
+        print(f"startup {baseline * 1000:.0f} ms -> {current * 1000:.0f} ms ({baseline / current:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
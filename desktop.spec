@@ -0,0 +1,59 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Fast-start desktop build: pyinstaller desktop.spec -> dist/main/main.exe
+#
+# Unlike main.spec (onefile), the application is laid out in a folder: a
+# onefile exe extracts all of Python, pandas and numpy to a temporary
+# directory on every launch. Distribute the whole dist/main folder.
+
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('templates', 'templates'), ('static', 'static'), ('migrations', 'migrations'), ('clients.db', '.')],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    # Optional dependencies pulled in by pandas/numpy/SQLAlchemy that the
+    # desktop app never uses (it always runs on SQLite)
+    excludes=[
+        'tkinter', 'IPython', 'jedi', 'matplotlib', 'scipy', 'pyarrow', 'numba', 'numexpr',
+        'bottleneck', 'tables', 'sqlalchemy.testing', 'pandas.tests', 'numpy.tests', 'numpy.f2py',
+        'pytest', 'setuptools', 'pip', 'psycopg', 'psycopg_binary', 'psycopg2', 'pgserver',
+    ],
+    noarchive=False,
+    # Bytecode compiled with -O at build time (asserts stripped); 2 would also
+    # drop the docstrings that click and pandas rely on
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='main',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    # UPX-packed libraries have to be decompressed at each launch
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=['logo.ico'],
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='main',
+)
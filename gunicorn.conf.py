@@ -0,0 +1,101 @@
+"""
+gunicorn settings, read from the working directory by 'gunicorn wsgi:app'.
+Every value can be overridden by its environment variable.
+
+Workers are processes, each serving GUNICORN_THREADS requests at a time
+(gthread). Defaults depend on the database:
+
+- SQLite has a single writer: a couple of processes are enough, extra
+  threads cover the requests waiting on reads and network.
+- PostgreSQL scales with processes. Each one keeps its own connection
+  pool, so WEB_CONCURRENCY x (DB_POOL_SIZE + DB_MAX_OVERFLOW) must stay
+  below the server's max_connections, and threads below the pool size
+  plus overflow.
+
+The master imports main and runs create_app() once (preload_app), then
+forks the workers. What belongs to one process is split accordingly: the
+background threads (WAL checkpoints) start in each worker (post_fork),
+the scans buffered by a worker are written when it stops (worker_exit),
+while the jobs interrupted by the last stop are failed in the master
+before any worker starts (when_ready), and the exit checkpoint of SQLite
+runs in the master only, once every worker is gone (on_exit).
+"""
+import multiprocessing
+import os
+import tempfile
+
+sqlite = os.environ.get('DATABASE_URL', 'sqlite').startswith('sqlite')
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2 if sqlite else multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 8 if sqlite else 4))
+
+# Scanners send a request every few seconds: keep their connection open
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 15))
+# Imports and exports run in background jobs, requests are short
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+# Time given to a stopping worker to finish its requests
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# Import main once in the master and fork the workers from it
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+# Background threads and the exit checkpoint are run by the hooks below,
+# not by create_app() (see main.start_background_tasks)
+os.environ['BACKGROUND_TASKS'] = '0'
+
+# Access log on stdout, an empty GUNICORN_ACCESS_LOG disables it
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+
+# Prometheus metrics on /metrics: every worker writes its samples to files
+# in this directory, a scrape of any worker sums them. Set before main is
+# imported, prometheus_client reads it at import.
+os.environ.setdefault('METRICS', '1')
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), f"assetflow-metrics-{bind.rsplit(':', 1)[-1]}"))
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+
+def on_starting(server):
+    # Samples left by a previous run would be added to this one's
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    for name in os.listdir(metrics_dir):
+        os.remove(os.path.join(metrics_dir, name))
+
+
+def when_ready(server):
+    # Before the workers start: fail the jobs interrupted by the last stop.
+    # The master loaded the app (index check, FTS) but serves nothing:
+    # close its database connections
+    from main import app, db, recover_jobs
+    with app.app_context():
+        recover_jobs()
+        db.engine.dispose()
+
+
+def post_fork(server, worker):
+    # Connections inherited from the master must not be used by the worker,
+    # drop them without closing the master's sockets
+    from main import app, db, start_background_tasks
+    with app.app_context():
+        db.engine.dispose(close=False)
+    start_background_tasks()
+
+
+def worker_exit(server, worker):
+    # Write the scans still buffered by this worker (see main.record_scan)
+    from main import flush_scans
+    flush_scans()
+
+
+def on_exit(server):
+    # Workers are stopped: empty the SQLite WAL, which a worker cannot do
+    # while its siblings still use the database
+    from main import sqlite_shutdown
+    sqlite_shutdown()
+
+
+def child_exit(server, worker):
+    # Drop the gauges of the dead worker from the aggregated metrics
+    if os.environ.get('METRICS') == '1':
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -97,6 +97,12 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        if connection.dialect.name == 'sqlite':
+            # batch_alter_table recreates tables; with foreign keys enforced
+            # (see set_sqlite_pragmas) dropping a referenced table would fail
+            connection.exec_driver_sql("PRAGMA foreign_keys = OFF")
+            connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -0,0 +1,57 @@
+"""Add article_fts full-text search index
+
+Revision ID: 0b284aacadf7
+Revises: 8a1d5b93ded4
+Create Date: 2026-10-17 10:03:18.554012
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b284aacadf7'
+down_revision = '8a1d5b93ded4'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ['matricule', 'designation', 'serial_number', 'marque', 'modele', 'qr_code', 'affecte_a']
+
+
+def upgrade():
+    # FTS5 is SQLite only, other backends use the LIKE fallback of search_articles()
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    cols = ", ".join(COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in COLUMNS)
+
+    op.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS article_fts USING fts5({cols}, "
+        "content='article', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS article_fts_ai AFTER INSERT ON article BEGIN "
+        f"INSERT INTO article_fts(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS article_fts_ad AFTER DELETE ON article BEGIN "
+        f"INSERT INTO article_fts(article_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS article_fts_au AFTER UPDATE ON article BEGIN "
+        f"INSERT INTO article_fts(article_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO article_fts(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    )
+    op.execute("INSERT INTO article_fts(article_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS article_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS article_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS article_fts_ai")
+    op.execute("DROP TABLE IF EXISTS article_fts")
@@ -0,0 +1,50 @@
+"""Add pg_trgm indexes for article search
+
+Revision ID: 7d2f8b6c4e91
+Revises: 3e7a0c5d9b14
+Create Date: 2026-10-17 19:22:47.031558
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2f8b6c4e91'
+down_revision = '3e7a0c5d9b14'
+branch_labels = None
+depends_on = None
+
+# Columns matched with ILIKE '%term%' by search_articles() when FTS5 is not available
+COLUMNS = ['matricule', 'designation', 'serial_number', 'marque', 'modele', 'qr_code', 'affecte_a']
+
+
+def upgrade():
+    # Trigram indexes are PostgreSQL only, SQLite searches through article_fts
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # Offline (--sql) scripts cannot query the server, assume contrib is installed
+    available = op.get_context().as_sql or bind.execute(sa.text(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    )).scalar()
+    if not available:
+        print("WARNING: pg_trgm is not installed on the server (postgresql-contrib), "
+              "article search will use sequential scans")
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_article_{column}_trgm "
+            f"ON article USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for column in COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_article_{column}_trgm")
@@ -0,0 +1,56 @@
+"""Add indexes on barcode, foreign keys and scan timestamp
+
+Revision ID: 8a1d5b93ded4
+Revises: c2dc06061fdd
+Create Date: 2026-10-17 09:12:41.207315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a1d5b93ded4'
+down_revision = 'c2dc06061fdd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # Empty barcodes are stored as NULL so they don't collide in the unique index
+    op.execute("UPDATE article SET qr_code = NULL WHERE TRIM(qr_code) = ''")
+
+    # Only make qr_code unique if the existing data allows it
+    duplicates = bind.execute(sa.text(
+        "SELECT COUNT(*) FROM (SELECT qr_code FROM article "
+        "WHERE qr_code IS NOT NULL GROUP BY qr_code HAVING COUNT(*) > 1) AS dup"
+    )).scalar()
+    if duplicates:
+        print(f"WARNING: {duplicates} duplicated qr_code value(s) in article, "
+              "ix_article_qr_code is created without UNIQUE")
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_article_qr_code'), ['qr_code'], unique=not duplicates)
+        batch_op.create_index(batch_op.f('ix_article_zone_id'), ['zone_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_article_site_id'), ['site_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_article_local_id'), ['local_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_article_famille_id'), ['famille_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_article_sous_famille_id'), ['sous_famille_id'], unique=False)
+
+    with op.batch_alter_table('scan_history', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_scan_history_timestamp'), ['timestamp'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('scan_history', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_scan_history_timestamp'))
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_article_sous_famille_id'))
+        batch_op.drop_index(batch_op.f('ix_article_famille_id'))
+        batch_op.drop_index(batch_op.f('ix_article_local_id'))
+        batch_op.drop_index(batch_op.f('ix_article_site_id'))
+        batch_op.drop_index(batch_op.f('ix_article_zone_id'))
+        batch_op.drop_index(batch_op.f('ix_article_qr_code'))
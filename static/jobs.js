@@ -0,0 +1,57 @@
+// Background jobs (imports / exports) started from the list pages.
+
+function csrfToken() {
+  const meta = document.querySelector('meta[name="csrf-token"]');
+  return meta ? meta.getAttribute("content") : "";
+}
+
+// Start a job with a POST to url, then poll it until it is done.
+// onProgress receives the job status ({status, processed, total, ...}).
+async function runJob(url, body, onProgress) {
+  const res = await fetch(url, {
+    method: "POST",
+    headers: { "X-CSRFToken": csrfToken() },
+    body: body
+  });
+  let job = await res.json();
+  if (!res.ok || !job.status_url) {
+    throw new Error(job.error || "Réponse serveur invalide");
+  }
+  while (job.status !== "done") {
+    if (job.status === "failed") throw new Error(job.error || "Échec du traitement");
+    if (onProgress) onProgress(job);
+    await new Promise(resolve => setTimeout(resolve, 1000));
+    job = await (await fetch(job.status_url)).json();
+  }
+  if (onProgress) onProgress(job);
+  return job;
+}
+
+function progressText(job) {
+  if (job.status === "pending") return "En attente…";
+  if (job.total) return `${job.processed} / ${job.total} lignes`;
+  return "En cours…";
+}
+
+// Links with data-export-job run the export in the background and
+// download the file once it is ready.
+document.addEventListener("click", async (event) => {
+  const link = event.target.closest("[data-export-job]");
+  if (!link) return;
+  event.preventDefault();
+
+  const button = link.closest(".btn-group")?.querySelector(".btn") || link;
+  const label = button.innerHTML;
+  button.classList.add("disabled");
+  try {
+    const job = await runJob(link.getAttribute("href"), null, job => {
+      button.textContent = `Export… ${progressText(job)}`;
+    });
+    window.location = job.download_url;
+  } catch (err) {
+    alert("Erreur lors de l'export: " + err.message);
+  } finally {
+    button.innerHTML = label;
+    button.classList.remove("disabled");
+  }
+});
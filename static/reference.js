@@ -0,0 +1,59 @@
+// Dropdown data (zones, sites, locaux, familles, sous-familles, salariés)
+// loaded from /api/reference. A copy is kept in localStorage and
+// revalidated with its ETag, so an unchanged version costs an empty 304.
+
+const REFERENCE_STORAGE_KEY = "assetflow.reference";
+
+// {"fields": [...], "rows": [[...]]} -> [{field: value, ...}]
+function expandRows(table) {
+  return table.rows.map(row => Object.fromEntries(table.fields.map((field, i) => [field, row[i]])));
+}
+
+async function loadReferenceData(url) {
+  let cached = null;
+  try {
+    cached = JSON.parse(localStorage.getItem(REFERENCE_STORAGE_KEY));
+  } catch (err) { /* ignore a corrupt copy */ }
+
+  let payload = cached ? cached.payload : null;
+  try {
+    const res = await fetch(url, {
+      cache: "no-store",
+      headers: cached ? { "If-None-Match": `"${cached.etag}"` } : {}
+    });
+    if (res.status === 200) {
+      payload = await res.json();
+      const etag = (res.headers.get("ETag") || "").replace(/"/g, "");
+      try {
+        localStorage.setItem(REFERENCE_STORAGE_KEY, JSON.stringify({ etag: etag, payload: payload }));
+      } catch (err) { /* storage full or disabled */ }
+    } else if (res.status !== 304) {
+      console.error("Reference data: HTTP " + res.status);
+    }
+  } catch (err) {
+    // Offline: keep using the local copy
+    console.error(err);
+  }
+  if (!payload) throw new Error("Données de référence indisponibles");
+
+  const data = {};
+  Object.keys(payload).forEach(name => {
+    if (payload[name] && payload[name].fields) data[name] = expandRows(payload[name]);
+  });
+  return data;
+}
+
+// Append one <option> per item; the option whose value equals the
+// select's data-selected attribute is selected.
+function fillSelect(select, items, { label = item => item.nom, value = item => item.id, decorate = null } = {}) {
+  if (!select) return;
+  const selected = select.dataset.selected || "";
+  const fragment = document.createDocumentFragment();
+  items.forEach(item => {
+    const option = new Option(label(item), value(item));
+    option.selected = String(value(item)) === selected;
+    if (decorate) decorate(option, item);
+    fragment.appendChild(option);
+  });
+  select.appendChild(fragment);
+}
@@ -0,0 +1,93 @@
+// Offline queue of the scanner. Scans and article saves are stored in
+// IndexedDB and sent to /api/sync in batches once the server is reachable,
+// so the operator never waits on the network between two scans.
+
+const SCAN_QUEUE_DB = "assetflow-scanner";
+const SCAN_QUEUE_STORE = "operations";
+const SYNC_BATCH_SIZE = 100;
+
+function openScanQueue() {
+  return new Promise((resolve, reject) => {
+    const req = indexedDB.open(SCAN_QUEUE_DB, 1);
+    req.onupgradeneeded = () => {
+      req.result.createObjectStore(SCAN_QUEUE_STORE, { keyPath: "seq", autoIncrement: true });
+    };
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = () => reject(req.error);
+  });
+}
+
+// Run action(store) in one transaction and resolve with its request result
+async function withScanQueue(mode, action) {
+  const db = await openScanQueue();
+  return new Promise((resolve, reject) => {
+    const tx = db.transaction(SCAN_QUEUE_STORE, mode);
+    const req = action(tx.objectStore(SCAN_QUEUE_STORE));
+    tx.oncomplete = () => resolve(req ? req.result : undefined);
+    tx.onerror = () => reject(tx.error);
+  });
+}
+
+function newOperationId() {
+  if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+  return Date.now().toString(36) + "-" + Math.random().toString(36).slice(2);
+}
+
+// op: {type: "scan", barcode} or {type: "upsert", barcode, fields, base}.
+// The id makes the operation idempotent on the server.
+async function enqueueOperation(op) {
+  const queued = Object.assign({ id: newOperationId(), queued_at: new Date().toISOString() }, op);
+  await withScanQueue("readwrite", store => store.add(queued));
+  return queued;
+}
+
+function pendingCount() {
+  return withScanQueue("readonly", store => store.count());
+}
+
+function syncCsrfToken() {
+  const meta = document.querySelector('meta[name="csrf-token"]');
+  return meta ? meta.getAttribute("content") : "";
+}
+
+async function postOperations(urls, operations) {
+  const send = () => fetch(urls.sync, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", "X-CSRFToken": syncCsrfToken() },
+    body: JSON.stringify({ operations: operations })
+  });
+  let res = await send();
+  if (res.status === 400) {
+    // The page may have stayed open offline longer than the CSRF token lifetime
+    const fresh = await (await fetch(urls.csrf)).json();
+    document.querySelector('meta[name="csrf-token"]').setAttribute("content", fresh.csrf_token);
+    res = await send();
+  }
+  if (!res.ok) throw new Error("HTTP " + res.status);
+  return res.json();
+}
+
+// Send the queue, oldest operations first. Every operation answered by the
+// server leaves the queue; the ones not applied (conflict, rejected) are
+// returned with their result so the page can show them. A network error
+// stops the sync and keeps the remaining operations for the next attempt.
+let runningSync = null;
+
+function syncQueue(urls) {
+  if (!runningSync) {
+    runningSync = (async () => {
+      const problems = [];
+      for (;;) {
+        const batch = await withScanQueue("readonly", store => store.getAll(null, SYNC_BATCH_SIZE));
+        if (!batch.length) break;
+        const response = await postOperations(urls, batch.map(({ seq, ...op }) => op));
+        response.results.forEach((result, i) => {
+          if (result.status !== "applied") problems.push(Object.assign({ operation: batch[i] }, result));
+        });
+        await withScanQueue("readwrite", store => { batch.forEach(op => store.delete(op.seq)); });
+      }
+      return problems;
+    })().finally(() => { runningSync = null; });
+  }
+  return runningSync;
+}
@@ -0,0 +1,68 @@
+// Service worker of the scanner: keeps the page and its scripts available
+// without network. Data changes made offline go through the IndexedDB
+// queue of scan-queue.js, not through this cache.
+
+const CACHE = "assetflow-scanner-v1";
+const PAGE = "/scanner";
+const ASSETS = [
+  "/static/html5-qrcode.min.js",
+  "/static/reference.js",
+  "/static/scan-queue.js",
+];
+const CDN_HOSTS = ["cdn.jsdelivr.net", "code.jquery.com"];
+
+function cacheable(response) {
+  // Opaque responses are the CDN files loaded without CORS
+  return response && !response.redirected && (response.ok || response.type === "opaque");
+}
+
+async function store(request, response) {
+  if (cacheable(response)) {
+    const cache = await caches.open(CACHE);
+    await cache.put(request, response.clone());
+  }
+  return response;
+}
+
+self.addEventListener("install", event => {
+  event.waitUntil(
+    Promise.all([PAGE, ...ASSETS].map(url =>
+      fetch(url, { credentials: "same-origin" }).then(res => store(url, res)).catch(() => null)
+    )).then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener("activate", event => {
+  event.waitUntil(
+    caches.keys()
+      .then(keys => Promise.all(keys.filter(key => key !== CACHE).map(key => caches.delete(key))))
+      .then(() => self.clients.claim())
+  );
+});
+
+self.addEventListener("fetch", event => {
+  const request = event.request;
+  if (request.method !== "GET") return;
+  const url = new URL(request.url);
+
+  if (request.mode === "navigate" && url.origin === self.location.origin && url.pathname === PAGE) {
+    // Network first, the cached page when offline
+    event.respondWith(
+      fetch(request)
+        .then(res => url.search ? res : store(PAGE, res))
+        .catch(() => caches.match(PAGE))
+    );
+  } else if ((url.origin === self.location.origin && url.pathname.startsWith("/static/")) || CDN_HOSTS.includes(url.host)) {
+    // Cached copy right away, refreshed in the background
+    event.respondWith(
+      caches.match(request).then(cached => {
+        const network = fetch(request).then(res => store(request, res));
+        if (cached) {
+          event.waitUntil(network.catch(() => null));
+          return cached;
+        }
+        return network;
+      })
+    );
+  }
+});
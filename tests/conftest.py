@@ -0,0 +1,97 @@
+"""
+Fixtures of the test suite. main reads DATABASE_URL when it is imported,
+so the whole run uses one database: a temporary SQLite file by default,
+or the database given by TEST_DATABASE_URL, e.g. a local PostgreSQL.
+That database is emptied first, never point it at real data.
+
+    python -m pytest
+    TEST_DATABASE_URL=postgresql://postgres@localhost/assetflow_test python -m pytest
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ['DATABASE_URL'] = (os.environ.get('TEST_DATABASE_URL')
+                              or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='assetflow-tests-'), 'test.db')}")
+# Templates and migrations are looked up from the working directory
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+import main  # noqa: E402
+from main import db  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def app():
+    """The application, on an empty database created by init_db() and upgraded by the migrations."""
+    from flask_migrate import upgrade
+
+    main.app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with main.app.app_context():
+        db.drop_all()
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("DROP TABLE IF EXISTS alembic_version")
+            conn.exec_driver_sql("DROP TABLE IF EXISTS article_fts")
+        main.init_db()
+        upgrade(directory=main.migrations_dir)
+    return main.app
+
+
+@pytest.fixture(autouse=True)
+def clean_database(app):
+    """Every test starts from empty tables, with the admin account."""
+    with app.app_context():
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+        main.init_db()
+    main._reference_cache["version"] = None
+    del main._scan_buffer[:]
+    yield
+
+
+@pytest.fixture
+def client(app):
+    """Test client logged in as admin."""
+    client = app.test_client()
+    response = client.post('/login', data={'username': 'admin', 'password': '12345'})
+    assert response.status_code == 302
+    return client
+
+
+@pytest.fixture
+def app_context(app):
+    with app.app_context():
+        yield
+
+
+@pytest.fixture
+def add_articles(app):
+    """
+    add_articles(count, **fields): insert count articles, each with its own
+    zone, site, local, famille and sous-famille. Returns their ids.
+    """
+    def add(count, **fields):
+        with app.app_context():
+            ids = []
+            for i in range(count):
+                n = db.session.execute(db.select(db.func.count(main.Article.id))).scalar() + 1
+                zone = main.Zone(nom=f"Zone {n}", pays="Sénégal")
+                site = main.Site(nom=f"Site {n}", zone=zone)
+                local = main.Locaux(nom=f"Bureau {n}", zone=zone, site=site)
+                famille = main.Famille(nom=f"Famille {n}", code=f"F{n}")
+                sous_famille = main.SousFamille(nom=f"Sous-famille {n}", famille=famille)
+                values = dict(matricule=f"MAT{n:05d}", designation=f"Ordinateur portable {n}",
+                              qr_code=f"QR{n:05d}", marque="Dell", modele="Latitude 5440")
+                values.update(fields)
+                article = main.Article(zone=zone, site=site, local=local, famille=famille,
+                                       sous_famille=sous_famille, **values)
+                db.session.add(article)
+                db.session.commit()
+                ids.append(article.id)
+            return ids
+    return add
@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import event
+
+from main import db
+
+
+def count_statements(app, client, url):
+    """Number of SQL statements run while answering a GET of url."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    assert response.status_code == 200
+    return len(statements)
+
+
+@pytest.mark.parametrize('url', ['/articles', '/articles/page'])
+def test_article_list_query_count_does_not_depend_on_rows(app, client, add_articles, url):
+    # Every article has its own zone, site, local, famille and sous-famille:
+    # lazy loading would add statements per row
+    add_articles(5)
+    client.get(url)  # reference data and other per-process caches
+    few = count_statements(app, client, url)
+    add_articles(45)
+    many = count_statements(app, client, url)
+    assert few == many
+
+
+def test_article_list_shows_relations(client, add_articles):
+    add_articles(2)
+    page = client.get('/articles').get_data(as_text=True)
+    assert 'Site 2' in page and 'Sous-famille 1' in page
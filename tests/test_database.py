@@ -0,0 +1,122 @@
+"""
+Database-dependent paths: migrations, search, offline sync and matricule
+allocation. They run on SQLite by default; set TEST_DATABASE_URL to a
+PostgreSQL database to cover the server setup (pg_trgm search, row locks
+of the matricule sequence).
+"""
+import threading
+
+import pytest
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import text
+
+import main
+from main import db
+
+
+def is_postgresql():
+    return main.app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql')
+
+
+def has_pg_trgm():
+    if not is_postgresql():
+        return False
+    with main.app.app_context():
+        return bool(db.session.execute(text(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).scalar())
+
+
+def current_revision():
+    return db.session.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def test_migrations_reach_head(app_context):
+    from alembic.script import ScriptDirectory
+    head = ScriptDirectory.from_config(main.migrate.get_config(main.migrations_dir)).get_current_head()
+    assert current_revision() == head
+
+    # Down past the trgm indexes and the slow-query table, then back up
+    downgrade(directory=main.migrations_dir, revision='3e7a0c5d9b14')
+    assert current_revision() == '3e7a0c5d9b14'
+    assert not db.inspect(db.engine).has_table('slow_query')
+    upgrade(directory=main.migrations_dir)
+    db.session.remove()
+    assert current_revision() == head
+    assert db.inspect(db.engine).has_table('slow_query')
+    if has_pg_trgm():
+        indexes = {index['name'] for index in db.inspect(db.engine).get_indexes('article')}
+        assert {'ix_article_designation_trgm', 'ix_article_qr_code_trgm'} <= indexes
+
+
+def test_search(client, add_articles):
+    add_articles(3)
+    add_articles(1, designation="Vidéoprojecteur Epson EB-X51", marque="Epson")
+    found = client.get('/articles/search?q=epson eb').json
+    assert found['count'] == 1 and 'EB-X51' in found['html']
+    assert client.get('/articles/search?q=ordinateur').json['count'] == 3
+    assert client.get('/articles/search?q=introuvable').json['count'] == 0
+
+
+def test_search_can_use_trgm_index(app_context, add_articles):
+    if not has_pg_trgm():
+        pytest.skip("needs PostgreSQL with pg_trgm (postgresql-contrib)")
+    add_articles(3)
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = "\n".join(conn.execute(text(
+            "EXPLAIN SELECT id FROM article WHERE designation ILIKE :term"), {"term": "%portable%"}).scalars())
+    assert 'ix_article_designation_trgm' in plan
+
+
+def test_sync_applies_scans_and_upserts_once(app, client, add_articles):
+    add_articles(1)
+    with app.app_context():
+        famille = db.session.execute(db.select(main.Famille)).scalar_one()
+        famille_id, code = famille.id, main.matricule_prefix(famille.code)
+    batch = {"operations": [
+        {"id": "op-1", "type": "scan", "barcode": "QR00001", "scanned_at": "2026-10-01T08:00:00Z"},
+        {"id": "op-2", "type": "upsert", "barcode": "NEW-1",
+         "fields": {"designation": "Chaise", "famille": str(famille_id)}},
+        {"id": "op-3", "type": "upsert", "barcode": "QR00001", "fields": {"statut": "En maintenance"},
+         "base": {"id": 1, "statut": ""}},
+        # Read before op-3 changed the statut
+        {"id": "op-4", "type": "upsert", "barcode": "QR00001", "fields": {"statut": "Hors Services"},
+         "base": {"id": 1, "statut": ""}},
+    ]}
+    results = client.post('/api/sync', json=batch).json['results']
+    assert [r['status'] for r in results] == ['applied', 'applied', 'applied', 'conflict']
+    assert results[1]['article']['matricule'].startswith(code)
+    assert results[3]['current']['statut'] == "En maintenance"
+
+    again = client.post('/api/sync', json=batch).json['results']
+    assert all(r['duplicate'] for r in again)
+    with app.app_context():
+        assert db.session.execute(db.select(db.func.count(main.ScanHistory.id))).scalar() == 1
+        assert db.session.execute(db.select(db.func.count(main.Article.id))).scalar() == 2
+
+
+def test_reserve_matricules_is_unique_under_concurrency(app):
+    with app.app_context():
+        first = main.reserve_matricules('PC', 3)
+        db.session.commit()
+    assert first == ['PC00000001', 'PC00000002', 'PC00000003']
+
+    reserved, errors = [], []
+
+    def reserve():
+        try:
+            with app.app_context():
+                for _ in range(5):
+                    reserved.extend(main.reserve_matricules('PC', 10))
+                    db.session.commit()
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=reserve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(reserved) == len(set(reserved)) == 200
+    assert max(reserved) == 'PC00000203'
@@ -0,0 +1,48 @@
+import io
+import os
+
+import pandas as pd
+from sqlalchemy import event
+
+import main
+from main import db
+
+
+def test_salary_import_requires_login(app):
+    uploads = set(os.listdir(main.jobs_dir))
+    response = app.test_client().post('/import_salaries', data={'file': (io.BytesIO(b"Matricule\n1\n"), 'a.csv')},
+                                      content_type='multipart/form-data')
+    assert response.status_code == 302 and '/login' in response.location
+    assert set(os.listdir(main.jobs_dir)) == uploads
+
+
+def test_article_import_checks_uniqueness_on_the_file_values(app_context, add_articles):
+    add_articles(3)
+    df = pd.DataFrame([
+        {'Matricule': 'MAT00001', 'Code-barre': 'NEW-1', 'Désignation': "Chaise"},
+        {'Matricule': 'NEW-MAT-2', 'Code-barre': 'QR00002', 'Désignation': "Chaise"},
+        {'Matricule': 'NEW-MAT-3', 'Code-barre': 'NEW-3', 'Désignation': "Chaise"},
+    ], columns=main.ARTICLE_EXPORT_HEADERS)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        summary, rejected = main.import_articles_frame(df)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert summary == {'inserted': 1, 'rejected': 2, 'total': 3}
+    assert list(rejected['Motif']) == ["Matricule déjà existant", "Code-barre déjà utilisé"]
+    # Only the file's values are looked up, not the whole table
+    lookups = [s for s in statements if s.startswith(('SELECT article.matricule', 'SELECT article.qr_code'))]
+    assert lookups and all(' IN ' in s for s in lookups)
+
+
+def test_salary_import_counts_updates(app_context):
+    db.session.add(main.Salarie(matricule='S001', nom_prenom="Awa Diop", departement="RH"))
+    db.session.commit()
+    df = pd.DataFrame({'Matricule': ['S001', 'S002', ''], 'Nom et Prénom': ["Awa Diop", "Moussa Fall", "Sans"],
+                       'Département': ["Finance", "IT", "IT"]})
+    assert main.import_salaries_frame(df) == {'inserted': 1, 'updated': 1, 'skipped': 1}
+    assert db.session.execute(db.select(main.Salarie.departement).where(main.Salarie.matricule == 'S001')).scalar() \
+        == "Finance"
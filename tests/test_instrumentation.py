@@ -0,0 +1,41 @@
+import copy
+import re
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+import main
+from main import db
+
+
+@pytest.fixture
+def slow_query_log(app):
+    """The slow-query listeners, registered for one test (SLOW_QUERY_MS is 0 by default)."""
+    saved = app.config['SLOW_QUERY_MS']
+    app.config['SLOW_QUERY_MS'] = 60000
+    event.listen(Engine, "before_cursor_execute", main.start_slow_query_timer)
+    event.listen(Engine, "after_cursor_execute", main.record_slow_query)
+    yield
+    event.remove(Engine, "before_cursor_execute", main.start_slow_query_timer)
+    event.remove(Engine, "after_cursor_execute", main.record_slow_query)
+    app.config['SLOW_QUERY_MS'] = saved
+
+
+def test_failed_statement_leaves_nothing_on_the_connection(app_context, slow_query_log):
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+        info = copy.deepcopy(dict(conn.info))
+        for _ in range(3):
+            with pytest.raises((OperationalError, ProgrammingError)):
+                conn.exec_driver_sql("SELECT * FROM no_such_table")
+            conn.rollback()
+        assert dict(conn.info) == info
+
+
+def test_server_timing_counts_queries(client, add_articles):
+    add_articles(2)
+    header = client.get('/articles').headers['Server-Timing']
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries, (\d+) ORM objects"', header)
+    assert match and int(match.group(1)) > 0 and int(match.group(2)) >= 2
@@ -0,0 +1,45 @@
+import pytest
+
+import main
+from main import db
+
+
+@pytest.fixture
+def campaign(app, add_articles):
+    """Open campaign on the site of one article (QR00001). Returns (campaign id, local id)."""
+    article_id, = add_articles(1)
+    with app.app_context():
+        article = db.session.get(main.Article, article_id)
+        campaign = main.InventoryCampaign(nom="Inventaire test", site_id=article.site_id)
+        db.session.add(campaign)
+        db.session.commit()
+        return campaign.id, article.local_id
+
+
+def scanned_codes(app, campaign_id):
+    with app.app_context():
+        return db.session.execute(db.select(main.InventoryScan.qr_code)
+                                  .where(main.InventoryScan.campaign_id == campaign_id)
+                                  .order_by(main.InventoryScan.qr_code)).scalars().all()
+
+
+def test_inventory_scans(app, client, campaign):
+    campaign_id, local_id = campaign
+    response = client.post(f'/inventaires/{campaign_id}/scans',
+                           json={'local_id': local_id, 'barcodes': ['QR00001', ' INCONNU', 'QR00001']})
+    assert response.status_code == 200 and response.json['received'] == 2
+    response = client.post(f'/inventaires/{campaign_id}/scans', data={'local_id': local_id, 'barcodes': 'AUTRE\n'})
+    assert response.status_code == 302
+    assert scanned_codes(app, campaign_id) == ['AUTRE', 'INCONNU', 'QR00001']
+
+
+@pytest.mark.parametrize('body', [
+    ['QR00001'],
+    {'barcodes': 'QR00001'},
+    {'barcodes': ['QR00001', None]},
+])
+def test_inventory_scans_rejects_malformed_body(app, client, campaign, body):
+    campaign_id, local_id = campaign
+    response = client.post(f'/inventaires/{campaign_id}/scans', json=body)
+    assert response.status_code == 400
+    assert scanned_codes(app, campaign_id) == []
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+import main
+from main import db
+
+
+@pytest.fixture
+def jobs_dir(monkeypatch, tmp_path):
+    """An empty jobs directory in place of data/jobs."""
+    monkeypatch.setattr(main, 'jobs_dir', str(tmp_path))
+    return tmp_path
+
+
+def add_job(status, file_path=None):
+    job = main.Job(kind='export', status=status, file_path=file_path and str(file_path))
+    db.session.add(job)
+    db.session.commit()
+    if file_path:
+        file_path.write_text("Matricule\n")
+    return job.id
+
+
+def test_recover_jobs_fails_interrupted_jobs(app_context, jobs_dir):
+    pending, running, done = add_job('pending'), add_job('running'), add_job('done', jobs_dir / 'export-3.csv')
+    upload = jobs_dir / 'tmpupload.xlsx'
+    upload.write_bytes(b"PK")
+
+    main.recover_jobs()
+    db.session.expire_all()
+    statuses = {job.id: job.status for job in db.session.execute(db.select(main.Job)).scalars()}
+    assert statuses == {pending: 'failed', running: 'failed', done: 'done'}
+    assert db.session.get(main.Job, running).error and db.session.get(main.Job, running).finished_at
+    assert sorted(os.listdir(jobs_dir)) == ['export-3.csv']
+
+
+def test_purge_jobs_keeps_the_newest(app, app_context, jobs_dir, monkeypatch):
+    monkeypatch.setitem(app.config, 'JOB_KEEP', 2)
+    ids = [add_job('done', jobs_dir / f'export-{n}.csv') for n in range(4)]
+    running = add_job('running')
+
+    main.purge_jobs()
+    remaining = db.session.execute(db.select(main.Job.id).order_by(main.Job.id)).scalars().all()
+    assert remaining == ids[2:] + [running]
+    assert sorted(os.listdir(jobs_dir)) == ['export-2.csv', 'export-3.csv']
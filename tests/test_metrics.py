@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+
+from conftest import ROOT
+
+# One serving process: sends barcode lookups, then prints /metrics if asked
+PROCESS = """
+import sys
+import main
+main.app.config.update(WTF_CSRF_ENABLED=False)
+with main.app.app_context():
+    main.init_db()
+client = main.app.test_client()
+client.post('/login', data={'username': 'admin', 'password': '12345'})
+for i in range(int(sys.argv[1])):
+    client.get(f'/article/get/INCONNU-{i}')
+if sys.argv[2:] == ['scrape']:
+    sys.stdout.write(client.get('/metrics').get_data(as_text=True))
+"""
+
+
+@pytest.fixture
+def metrics_on(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS', True)
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', '')
+
+
+def test_metrics_without_token_answer_local_requests_only(app, metrics_on):
+    client = app.test_client()
+    assert client.get('/metrics').status_code == 200
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '10.0.0.5'}).status_code == 403
+    # Reverse proxy on the same host
+    assert client.get('/metrics', headers={'X-Forwarded-For': '10.0.0.5'}).status_code == 403
+
+
+def test_metrics_token(app, metrics_on, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'secret')
+    client = app.test_client()
+    assert client.get('/metrics').status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer secret'},
+                          environ_base={'REMOTE_ADDR': '10.0.0.5'})
+    assert response.status_code == 200
+
+
+def test_metrics_are_summed_across_processes(tmp_path):
+    metrics_dir = tmp_path / 'metrics'
+    metrics_dir.mkdir()
+    env = dict(os.environ, METRICS='1', PROMETHEUS_MULTIPROC_DIR=str(metrics_dir),
+               DATABASE_URL=f"sqlite:///{tmp_path / 'metrics.db'}")
+    run = lambda *args: subprocess.run([sys.executable, '-c', PROCESS, *args], cwd=ROOT, env=env,
+                                       check=True, capture_output=True, text=True).stdout
+    run('3')
+    families = {family.name: family for family in text_string_to_metric_families(run('2', 'scrape'))}
+
+    requests = {(s.labels['endpoint'], s.labels['status']): s.value
+                for s in families['assetflow_http_requests'].samples if s.name.endswith('_total')}
+    assert requests[('get_article_by_barcode', '404')] == 5
+    assert requests[('login', '302')] == 2
+    durations = {(s.name, s.labels.get('le')): s.value
+                 for s in families['assetflow_http_request_duration_seconds'].samples
+                 if s.labels['endpoint'] == 'get_article_by_barcode'}
+    assert durations[('assetflow_http_request_duration_seconds_bucket', '+Inf')] == 5
+    assert durations[('assetflow_http_request_duration_seconds_count', None)] == 5
+    assert durations[('assetflow_http_request_duration_seconds_sum', None)] > 0
+    assert 'assetflow_jobs' in families
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+import main
+from main import db
+
+
+def scan_count(app):
+    main.flush_scans()
+    with app.app_context():
+        return db.session.execute(db.select(db.func.count(main.ScanHistory.id))).scalar()
+
+
+def test_barcode_lookup_records_scan(app, client, add_articles):
+    add_articles(1)
+    assert client.get('/article/get/QR00001').json['matricule'] == 'MAT00001'
+    assert client.get('/article/get/INCONNU').status_code == 404
+    assert scan_count(app) == 2
+
+
+def test_barcode_lookup_requires_login(app, add_articles):
+    add_articles(1)
+    response = app.test_client().get('/article/get/QR00001')
+    assert response.status_code == 302 and '/login' in response.location
+    assert scan_count(app) == 0
+
+
+def test_scanner_form_records_no_scan(app, client, add_articles):
+    add_articles(1)
+    assert client.get('/scanner?barcode=QR00001').status_code == 200
+    response = client.post('/scanner', data={'barcode': 'QR00001', 'designation': "Ordinateur portable 1",
+                                             'statut': "En maintenance"}, follow_redirects=True)
+    assert response.status_code == 200
+    assert scan_count(app) == 0
+
+
+def test_barcode_batch(app, client, add_articles):
+    add_articles(2)
+    response = client.post('/article/get-batch', json={'barcodes': ['QR00002', ' QR00001', 'QR00002', 'INCONNU']})
+    assert response.status_code == 200
+    assert sorted(response.json['found']) == ['QR00001', 'QR00002']
+    assert response.json['missing'] == ['INCONNU']
+    assert scan_count(app) == 3
+
+
+@pytest.mark.parametrize('body', [
+    ['QR00001'],
+    {'barcodes': 'QR00001'},
+    {'barcodes': ['QR00001', 12]},
+    {'barcodes': {'code': 'QR00001'}},
+])
+def test_barcode_batch_rejects_malformed_body(app, client, add_articles, body):
+    add_articles(1)
+    assert client.post('/article/get-batch', json=body).status_code == 400
+    assert scan_count(app) == 0
+
+
+def test_sqlite_shutdown_flushes_scans_before_emptying_the_wal(app, add_articles):
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            pytest.skip("SQLite only")
+        wal = db.engine.url.database + '-wal'
+    add_articles(1)
+    with app.test_request_context():
+        main.record_scan('QR00001')
+    main.sqlite_shutdown()
+    with app.app_context():
+        assert db.session.execute(db.select(db.func.count(main.ScanHistory.id))).scalar() == 1
+        db.session.close()
+    assert not os.path.exists(wal) or os.path.getsize(wal) == 0
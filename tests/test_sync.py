@@ -0,0 +1,54 @@
+import pytest
+
+import main
+from main import db
+
+
+def test_sync_rejects_malformed_operations_only(app, client, add_articles):
+    add_articles(1)
+    batch = {"operations": [
+        {"id": "op-1", "type": "upsert", "barcode": "QR00001", "fields": ["statut", "En maintenance"]},
+        {"id": "op-2", "type": "upsert", "barcode": "QR00001", "fields": {"statut": "En maintenance"},
+         "base": "QR00001"},
+        "op-3",
+        {"id": "op-4", "type": "scan", "barcode": "QR00001"},
+        {"id": "op-5", "type": "upsert", "barcode": "NEW-1", "fields": {"designation": "Chaise"}},
+    ]}
+    response = client.post('/api/sync', json=batch)
+    assert response.status_code == 200
+    results = response.json['results']
+    assert [r['status'] for r in results] == ['rejected', 'rejected', 'rejected', 'applied', 'applied']
+    with app.app_context():
+        assert db.session.execute(db.select(db.func.count(main.ScanHistory.id))).scalar() == 1
+        assert db.session.execute(db.select(main.Article.statut).where(main.Article.qr_code == 'QR00001')).scalar() \
+            != "En maintenance"
+        assert db.session.execute(db.select(main.Article).where(main.Article.qr_code == 'NEW-1')).scalar()
+
+
+@pytest.mark.parametrize('body', [[{"id": "op-1", "type": "scan", "barcode": "QR00001"}], {"operations": "op-1"}])
+def test_sync_rejects_malformed_body(client, body):
+    assert client.post('/api/sync', json=body).status_code == 400
+
+
+def test_reserve_matricules(app, client, add_articles):
+    add_articles(1)
+    with app.app_context():
+        famille = db.session.execute(db.select(main.Famille)).scalar_one()
+        famille_id, code = famille.id, main.matricule_prefix(famille.code)
+    response = client.post('/api/matricules/reserve', json={'famille_id': famille_id, 'count': 3})
+    assert response.status_code == 200
+    matricules = response.json['matricules']
+    assert len(set(matricules)) == 3 and all(m.startswith(code) for m in matricules)
+
+
+@pytest.mark.parametrize('body', [
+    [1],
+    {'count': True},
+    {'count': '3'},
+    {'count': 0},
+    {'famille_id': 'abc'},
+    {'famille_id': True},
+    {'famille_id': 999999},
+])
+def test_reserve_matricules_rejects_malformed_body(client, body):
+    assert client.post('/api/matricules/reserve', json=body).status_code == 400
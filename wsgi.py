@@ -0,0 +1,8 @@
+"""
+WSGI entry point for production servers, settings in gunicorn.conf.py:
+
+    gunicorn wsgi:app
+"""
+from main import create_app
+
+app = create_app()